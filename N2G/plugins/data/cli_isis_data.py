@@ -9,9 +9,9 @@ Show commands output from devices parsed using TTP Templates into a dictionary s
 
 After parsing, results processed further to form a dictionary of nodes and links keyed
 by unique nodes and links identifiers, dictionary values are nodes dictionaries and for links
-it is a list of dictionaries of links between pair of nodes. For nodes ISIS RID
-used as a unique ID, for links it is sorted tuple of ``source``, ``target`` and ``label``
-keys' values. This structure helps to eliminate duplicates.
+it is a dictionary of links between pair of nodes keyed by links' attributes tuple. For nodes ISIS RID
+used as a unique ID, for links it is a tuple of sorted ``source`` and ``target`` followed
+by ``label`` keys' values. This structure helps to eliminate duplicates.
 
 Next step is post processing, such as packing links between nodes or IP lookups.
 
@@ -167,9 +167,13 @@ API Reference
 import logging
 import json
 import os
+import sys
 import csv
-import ipaddress
-from fnmatch import fnmatchcase
+import re
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import translate
+from itertools import chain
 from N2G.utils import merge_dict
 
 try:
@@ -183,6 +187,53 @@ except ImportError:
 # initiate logging
 log = logging.getLogger(__name__)
 
+# -----------------------------------------------------------------------------
+# Helper functions:
+# -----------------------------------------------------------------------------
+
+_description_encoder = json.JSONEncoder(
+    sort_keys=True, indent=4, separators=(",", ": ")
+)
+
+
+def _dump_description(data: dict) -> str:
+    """
+    Helper function to serialize node or link data into description string.
+
+    :param data: (dict) node or link data dictionary
+    """
+    return _description_encoder.encode(data)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_template(platform_name: str) -> str:
+    """
+    Helper function to load and cache TTP template for given platform.
+
+    :param platform_name: (str) platform name e.g. ``cisco_xr``
+    """
+    return get_template(misc="N2G/cli_isis_data/{}.txt".format(platform_name))
+
+
+def _parse_inputs(ttp_vars: dict, platform_name: str, inputs: list) -> list:
+    """
+    Helper function to parse platform inputs using TTP, runs in child
+    process if parsing in parallel.
+
+    :param ttp_vars: (dict) TTP parser object vars
+    :param platform_name: (str) platform name e.g. ``cisco_xr``
+    :param inputs: (list) text items or OS paths to parse
+    :return: list of parsing results
+    """
+    parser = ttp(vars=ttp_vars, log_level="ERROR")
+    parser.add_template(
+        template=_get_template(platform_name), template_name=platform_name
+    )
+    for item in inputs:
+        parser.add_input(item, template_name=platform_name)
+    parser.parse(one=True)
+    return parser.result(structure="flat_list")
+
 
 # -----------------------------------------------------------------------------
 # Main class:
@@ -200,6 +251,8 @@ class cli_isis_data:
     :param add_connected: (bool) if True, will add connected subnets as nodes, default is False
     :param ptp_filter: (list) list of glob patterns to filter point-to-point links based on link IP
     :param add_data: (bool) if True (default) adds data information to nodes and links
+    :param processes: (int) number of processes to parse data in parallel, default is 1
+      - parse data in current process
 
     ``ip_lookup_data`` dictionary must be keyed by ISSI RID IP address, with values
     being dictionary which must contain ``hostname`` key with optional additional keys
@@ -236,17 +289,25 @@ class cli_isis_data:
         ptp_filter: list = None,
         add_data: bool = True,
         platforms: list = None,
+        processes: int = 1,
     ):
         self.ttp_vars = ttp_vars or {}
         self.drawing = drawing
         self.drawing.node_duplicates = "update"
         self.add_connected = add_connected
         self.ptp_filter = ptp_filter or []
+        self._ptp_filter_re = (
+            re.compile("|".join("(?:{})".format(translate(p)) for p in self.ptp_filter))
+            if self.ptp_filter
+            else None
+        )
         self.add_data = add_data
         self.platforms = platforms or ["_all_"]
+        self.processes = processes or 1
         self.parsed_data = {}
         self.nodes_dict = {}
         self.links_dict = {}
+        self._node_data = {}
         self.graph_dict = {"nodes": [], "links": []}
         self.ip_lookup_data = ip_lookup_data or {}
         self._load_ip_lookup_data()
@@ -318,7 +379,10 @@ class cli_isis_data:
 
         :param data: (dict) link dictionary with source, target and label keys
         """
-        return tuple(sorted([data["source"], data["target"], data.get("label", "")]))
+        source, target = data["source"], data["target"]
+        if source <= target:
+            return (source, target, data.get("label", ""))
+        return (target, source, data.get("label", ""))
 
     def _parse(self, data: [dict, str]) -> None:
         """
@@ -331,7 +395,7 @@ class cli_isis_data:
             raise ModuleNotFoundError(
                 "N2G:cli_isis_data failed importing TTP, is it installed?"
             )
-        parser = ttp(vars=self.ttp_vars, log_level="ERROR")
+        inputs = {}
         # process data dictionary
         if isinstance(data, dict):
             for platform_name, text_list in data.items():
@@ -340,15 +404,10 @@ class cli_isis_data:
                     and not platform_name in self.platforms
                 ):
                     continue
-                ttp_template = get_template(
-                    misc="N2G/cli_isis_data/{}.txt".format(platform_name)
-                )
-                parser.add_template(template=ttp_template, template_name=platform_name)
-                for item in text_list:
-                    parser.add_input(item, template_name=platform_name)
+                inputs[platform_name] = list(text_list)
         # process directories at OS path
         elif isinstance(data, str):
-            # get all sub-folders and load respective templates
+            # get all sub-folders to parse with respective templates
             with os.scandir(data) as dirs:
                 for entry in dirs:
                     if entry.is_dir():
@@ -358,21 +417,34 @@ class cli_isis_data:
                             and not platform_name in self.platforms
                         ):
                             continue
-                        ttp_template = get_template(
-                            misc="N2G/cli_isis_data/{}.txt".format(platform_name)
-                        )
-                        parser.add_template(
-                            template=ttp_template, template_name=platform_name
-                        )
-                        parser.add_input(
-                            data=os.path.abspath(entry), template_name=platform_name
-                        )
+                        with os.scandir(entry.path) as files:
+                            inputs[platform_name] = [
+                                os.path.abspath(f.path) for f in files if f.is_file()
+                            ]
         else:
             raise TypeError(
                 "Expecting dictionary or string, but '{}' given".format(type(data))
             )
-        parser.parse(one=True)
-        self.parsed_data = parser.result(structure="flat_list")
+        self.parsed_data = []
+        if self.processes > 1:
+            # split each platform inputs in chunks to parse in parallel
+            jobs = []
+            for platform_name, items in inputs.items():
+                # drop duplicate inputs same way as TTP does
+                items = list(dict.fromkeys(items))
+                chunk_size = max(1, -(-len(items) // self.processes))
+                for i in range(0, len(items), chunk_size):
+                    jobs.append((platform_name, items[i : i + chunk_size]))
+            with ProcessPoolExecutor(max_workers=self.processes) as executor:
+                for result in executor.map(
+                    functools.partial(_parse_inputs, self.ttp_vars), *zip(*jobs)
+                ):
+                    self.parsed_data.extend(result)
+        else:
+            for platform_name, items in inputs.items():
+                self.parsed_data.extend(
+                    _parse_inputs(self.ttp_vars, platform_name, items)
+                )
         # import pprint; pprint.pprint(self.parsed_data, width = 100)
 
     def _process_lsp(self, lsp: dict, isis_pid: str, hostname: str) -> None:
@@ -383,15 +455,20 @@ class cli_isis_data:
         :param isis_pid: (str) ISIS Process ID string
         :param hostname: device hostname LSP belongs to
         """
+        # intern strings repeated across LSPs to share them between nodes and links
+        hostname = sys.intern(hostname)
+        isis_pid = sys.intern(isis_pid)
         # make node out of router LSP
         node = {"id": hostname, "label": hostname, "bottom_label": "Node"}
         if lsp.get("rid") or lsp.get("rid_v6"):
-            node["top_label"] = lsp.get("rid") or lsp.get("rid_v6")
+            node["top_label"] = sys.intern(lsp.get("rid") or lsp.get("rid_v6"))
         self._add_node(node, node_data=lsp)
         # go over links
         for link in lsp.get("links", []):
             # ignore ISIS links based on IP addresses
-            if any([fnmatchcase(link.get("local_ip", ""), p) for p in self.ptp_filter]):
+            if self._ptp_filter_re and self._ptp_filter_re.match(
+                link.get("local_ip", "")
+            ):
                 continue
             self._add_link(
                 link={
@@ -399,10 +476,10 @@ class cli_isis_data:
                     "src_label": "{}:{}".format(
                         link.get("local_ip", link.get("local_intf_id")), link["metric"]
                     ),
-                    "label": "{}:{}".format(
-                        isis_pid, lsp["level"].replace("Level-", "L")
+                    "label": sys.intern(
+                        "{}:{}".format(isis_pid, lsp["level"].replace("Level-", "L"))
                     ),
-                    "target": link["peer_name"],
+                    "target": sys.intern(link["peer_name"]),
                     "local_intf_id": link.get("local_intf_id"),
                     "peer_intf_id": link.get("peer_intf_id"),
                     "peer_ip": link.get("peer_ip"),
@@ -413,10 +490,11 @@ class cli_isis_data:
         # go over connected subnets
         if self.add_connected:
             for network in lsp.get("networks", []):
+                subnet = sys.intern(network["network"])
                 self._add_node(
                     node={
-                        "id": network["network"],
-                        "label": network["network"],
+                        "id": subnet,
+                        "label": subnet,
                         "bottom_label": "Subnet",
                     }
                 )
@@ -425,126 +503,123 @@ class cli_isis_data:
                         "source": hostname,
                         "src_label": "M:{}".format(network["metric"]),
                         "label": lsp["level"],
-                        "target": network["network"],
+                        "target": subnet,
                     }
                 )
 
     def _form_base_graph_dict(self) -> None:
+        process_lsp = self._process_lsp
         for device in self.parsed_data:
+            isis_processes = device.get("isis_processes")
+            if not isis_processes:
+                continue
             # go over all ISIS processes on the box
-            for isis_pid, isis_data in device.get("isis_processes", {}).items():
+            for isis_pid, isis_data in isis_processes.items():
                 # process LSP
                 for hostname, lsps in isis_data.items():
                     for lsp in lsps:
-                        self._process_lsp(lsp, isis_pid, hostname)
+                        process_lsp(lsp, isis_pid, hostname)
 
-    def _add_node(self, node: dict, node_data: dict = {}) -> None:
+    def _add_node(self, node: dict, node_data: dict = None) -> None:
+        stored_node = self.nodes_dict.get(node["id"])
         # add new node
-        if not node["id"] in self.nodes_dict:
+        if stored_node is None:
             if node_data and self.add_data:
-                node["description"] = json.dumps(
-                    node_data, sort_keys=True, indent=4, separators=(",", ": ")
-                )
+                self._node_data[node["id"]] = dict(node_data)
             self.nodes_dict[node["id"]] = node
-        # merge existing and new nodes
+        # update node attributes if they do not exist already
         else:
-            node_ref = self.nodes_dict[node["id"]]
-            merge_dict(node_ref, node)
+            for key, value in node.items():
+                if key not in stored_node:
+                    stored_node[key] = value
+            # merge node data, it is serialized once in _update_drawing
             if node_data and self.add_data:
-                data_ref = json.loads(node_ref.get("description", "{}"))
-                merge_dict(data_ref, node_data)
-                node_ref["description"] = json.dumps(
-                    data_ref, sort_keys=True, indent=4, separators=(",", ": ")
-                )
+                merge_dict(self._node_data.setdefault(node["id"], {}), node_data)
 
-    def _add_link(self, link: dict, link_data: dict = {}) -> None:
+    def _add_link(self, link: dict, link_data: dict = None) -> None:
         link_hash = self._make_hash_tuple(link)
-        self.links_dict.setdefault(link_hash, [])
-        if link not in self.links_dict[link_hash]:
+        link_key = (
+            link["source"],
+            link["target"],
+            link.get("label"),
+            link.get("src_label"),
+            link.get("trgt_label"),
+            link.get("local_intf_id"),
+            link.get("peer_intf_id"),
+            link.get("local_ip"),
+            link.get("peer_ip"),
+        )
+        links = self.links_dict.setdefault(link_hash, {})
+        if link_key not in links:
             if link_data and self.add_data:
-                link["description"] = json.dumps(
-                    link_data, sort_keys=True, indent=4, separators=(",", ": ")
-                )
-            self.links_dict[link_hash].append(link)
+                link["_data"] = link_data
+            links[link_key] = link
 
     def _pack_links(self) -> None:
         """
         Method to iterate over links between node pairs and pack links based
         on the local and peer interface IDs
         """
-        for hash in self.links_dict.keys():
-            links = self.links_dict[hash]
+        links_dict, self.links_dict = self.links_dict, {}
+        for link_hash, links in links_dict.items():
             # continue if only one link between node pairs
             if len(links) <= 1:
+                self.links_dict[link_hash] = links
                 continue
-            self.links_dict[hash] = []
-            while links:
-                link = links.pop()
+            links = list(links.values())
+            # index links by interface IDs and IP addresses to look up pairs
+            by_intf, by_ip = {}, {}
+            for index, link in enumerate(links):
+                by_intf.setdefault(
+                    (link.get("local_intf_id"), link.get("peer_intf_id")), []
+                ).append(index)
+                by_ip.setdefault(
+                    (link.get("local_ip"), link.get("peer_ip")), []
+                ).append(index)
+            # flags of links already packed or added back, indexed as links
+            removed = bytearray(len(links))
+            for index in reversed(range(len(links))):
+                if removed[index]:
+                    continue
+                removed[index] = 1
+                link = links[index]
                 pair_link_index = None
-                local_intf_id = link.pop("local_intf_id")
-                peer_intf_id = link.pop("peer_intf_id")
-                peer_ip = link.pop("peer_ip")
-                local_ip = link.pop("local_ip")
+                local_intf_id = link.pop("local_intf_id", None)
+                peer_intf_id = link.pop("peer_intf_id", None)
+                peer_ip = link.pop("peer_ip", None)
+                local_ip = link.pop("local_ip", None)
                 # try to find link pair using ISIS interface ID
                 if local_intf_id and peer_intf_id:
-                    for link_2 in links:
-                        if (
-                            link_2["peer_intf_id"] == local_intf_id
-                            and link_2["local_intf_id"] == peer_intf_id
-                        ):
-                            link["trgt_label"] = link_2["src_label"]
-                            self._add_link(
-                                link=link,
-                                link_data={
-                                    **json.loads(link["description"]),
-                                    **json.loads(link_2["description"]),
-                                },
-                            )
-                            # form new link label if PID does not match
-                            if link["label"] != link_2["label"]:
-                                pid_1, level_1 = link["label"].split(":")
-                                pid_2, level_2 = link_2["label"].split(":")
-                                link["label"] = "{}:{}".format(
-                                    pid_1
-                                    if pid_1 == pid_2
-                                    else "{}-{}".format(pid_1, pid_2),
-                                    level_1,
-                                )
-                            pair_link_index = links.index(link_2)
-                            break
+                    candidates = by_intf.get((peer_intf_id, local_intf_id), [])
                 # try to find link pair using interface IP addresses
                 elif local_ip and peer_ip:
-                    for link_2 in links:
-                        if (
-                            link_2["peer_ip"] == local_ip
-                            and link_2["local_ip"] == peer_ip
-                        ):
-                            link["trgt_label"] = link_2["src_label"]
-                            self._add_link(
-                                link=link,
-                                link_data={
-                                    **json.loads(link["description"]),
-                                    **json.loads(link_2["description"]),
-                                },
-                            )
-                            # form new link label if PID does not match
-                            if link["label"] != link_2["label"]:
-                                pid_1, level_1 = link["label"].split(":")
-                                pid_2, level_2 = link_2["label"].split(":")
-                                link["label"] = "{}:{}".format(
-                                    pid_1
-                                    if pid_1 == pid_2
-                                    else "{}-{}".format(pid_1, pid_2),
-                                    level_1,
-                                )
-                            pair_link_index = links.index(link_2)
-                            break
-                # remove link from links if it was combined
-                if pair_link_index is not None:
-                    _ = links.pop(pair_link_index)
-                # add link back to links if have not found a match for it
+                    candidates = by_ip.get((peer_ip, local_ip), [])
                 else:
+                    candidates = []
+                for pair_index in candidates:
+                    if not removed[pair_index]:
+                        pair_link_index = pair_index
+                        break
+                # add link back to links if have not found a match for it
+                if pair_link_index is None:
                     self._add_link(link)
+                    continue
+                # combine link with its pair and remove pair from links
+                removed[pair_link_index] = 1
+                link_2 = links[pair_link_index]
+                link["trgt_label"] = link_2["src_label"]
+                # merge pair link data into this link data dictionary
+                link_data = link.pop("_data", {})
+                link_data.update(link_2.get("_data", {}))
+                self._add_link(link=link, link_data=link_data)
+                # form new link label if PID does not match
+                if link["label"] != link_2["label"]:
+                    pid_1, level_1 = link["label"].split(":", 1)
+                    pid_2 = link_2["label"].split(":", 1)[0]
+                    link["label"] = "{}:{}".format(
+                        pid_1 if pid_1 == pid_2 else "{}-{}".format(pid_1, pid_2),
+                        level_1,
+                    )
 
     def _lookup_rid(self):
         """
@@ -566,29 +641,32 @@ class cli_isis_data:
         Method to search for link IP addresses in lookup table and add
         interface names to the link labels.
         """
+        lookup = self.ip_lookup_data.get
         for links in self.links_dict.values():
-            for link in links:
+            for link in links.values():
                 # modify source label
                 if link.get("src_label"):
-                    link_src_ip, link_src_metric = link["src_label"].split(":")
+                    link_src_ip, link_src_metric = link["src_label"].rsplit(":", 1)
                     # skip link_src_ip if its not IPv4 address
                     if link_src_ip.count(".") != 3:
                         continue
-                    if self.ip_lookup_data.get(link_src_ip, {}).get("interface"):
+                    interface = lookup(link_src_ip, {}).get("interface")
+                    if interface:
                         link["src_label"] = "{}:{}:{}".format(
-                            self.ip_lookup_data[link_src_ip]["interface"],
+                            interface,
                             link_src_ip,
                             link_src_metric,
                         )
                 # modify target label
                 if link.get("trgt_label"):
-                    link_trgt_ip, link_trgt_metric = link["trgt_label"].split(":")
+                    link_trgt_ip, link_trgt_metric = link["trgt_label"].rsplit(":", 1)
                     # skip link_trgt_ip if its not IPv4 address
                     if link_trgt_ip.count(".") != 3:
                         continue
-                    if self.ip_lookup_data.get(link_trgt_ip, {}).get("interface"):
+                    interface = lookup(link_trgt_ip, {}).get("interface")
+                    if interface:
                         link["trgt_label"] = "{}:{}:{}".format(
-                            self.ip_lookup_data[link_trgt_ip]["interface"],
+                            interface,
                             link_trgt_ip,
                             link_trgt_metric,
                         )
@@ -598,7 +676,15 @@ class cli_isis_data:
         Method to add formed links and nodes to the drawing object
         """
         self.graph_dict["nodes"] = list(self.nodes_dict.values())
-        for i in self.links_dict.values():
-            self.graph_dict["links"].extend(i)
+        self.graph_dict["links"] = list(
+            chain.from_iterable(links.values() for links in self.links_dict.values())
+        )
+        # serialize nodes and links data once, after all merges are done
+        for node_id, node_data in self._node_data.items():
+            self.nodes_dict[node_id]["description"] = _dump_description(node_data)
+        for link in self.graph_dict["links"]:
+            link_data = link.pop("_data", None)
+            if link_data:
+                link["description"] = _dump_description(link_data)
         # import pprint; pprint.pprint(self.graph_dict, width =100)
         self.drawing.from_dict(self.graph_dict)
@@ -1,5 +1,7 @@
 import sys
 sys.path.insert(0,'..')
+import os
+import shutil
 import pprint
 
 # after updated sys path, can do N2G import from parent dir
@@ -553,4 +555,113 @@ def test_cli_isis_yed_data_dict_base_platform_filter():
     drawer.work(mock_data_xr)
     assert not drawer.parsed_data
             
-# test_cli_isis_yed_data_dict_base_platform_filter()
\ No newline at end of file
+# test_cli_isis_yed_data_dict_base_platform_filter()
+
+def test_cli_isis_yed_data_dict_no_data():
+    drawing = create_yed_diagram()
+    drawer = cli_isis_data(drawing, add_data=False)
+    drawer.work(mock_data_xr)
+    assert drawer.graph_dict["links"]
+    assert not any("description" in i for i in drawer.graph_dict["links"])
+    assert not any("description" in i for i in drawer.graph_dict["nodes"])
+            
+# test_cli_isis_yed_data_dict_no_data()
+
+
+def test_cli_isis_yed_data_dict_duplicate_lsdb():
+    # same LSDB collected from two routers in the same area
+    lsdb_x2 = mock_data_xr["cisco_xr"][0].replace("ROUTER-X1#", "ROUTER-X2#")
+    drawer_one = cli_isis_data(create_yed_diagram())
+    drawer_one.work(mock_data_xr)
+    drawer_two = cli_isis_data(create_yed_diagram())
+    drawer_two.work({"cisco_xr": [mock_data_xr["cisco_xr"][0], lsdb_x2]})
+    assert len(drawer_two.parsed_data) == 2
+    assert len(drawer_two.graph_dict["links"]) == 14
+    assert len(drawer_two.graph_dict["links"]) == len(drawer_one.graph_dict["links"])
+    assert not any("_data" in i for i in drawer_two.graph_dict["links"])
+            
+# test_cli_isis_yed_data_dict_duplicate_lsdb()
+
+
+def test_cli_isis_ip_lookup_data_csv():
+    drawing = create_yed_diagram()
+    drawer = cli_isis_data(drawing, ip_lookup_data="./Data/isis_lsdb_lookup.csv")
+    assert drawer.ip_lookup_data == {
+        "10.211.1.1": {
+            "ip": "10.211.1.1",
+            "hostname": "ROUTER-X1",
+            "bottom_label": "1 St address, City X",
+            "interface": "",
+        },
+        "10.123.0.17": {
+            "ip": "10.123.0.17",
+            "hostname": "ROUTER-X1",
+            "bottom_label": "",
+            "interface": "Gi0/0/0/1",
+        },
+        # row with missing fields
+        "10.123.0.18": {
+            "ip": "10.123.0.18",
+            "hostname": "ROUTER-X2",
+            "bottom_label": None,
+            "interface": None,
+        },
+    }
+            
+# test_cli_isis_ip_lookup_data_csv()
+
+
+def test_cli_isis_yed_data_dict_processes():
+    with open("./Data/SAMPLE_CISCO_IOSXR_ISIS_LSDB/router-1.txt") as f:
+        sample_lsdb = f.read()
+    data = {
+        "cisco_xr": [
+            mock_data_xr["cisco_xr"][0],
+            mock_data_xr["cisco_xr"][0].replace("ROUTER-X1#", "ROUTER-X2#"),
+            sample_lsdb,
+        ]
+    }
+    drawer_one = cli_isis_data(create_yed_diagram())
+    drawer_one.work(data)
+    drawer_multi = cli_isis_data(create_yed_diagram(), processes=3)
+    drawer_multi.work(data)
+    assert len(drawer_one.parsed_data) == 3
+    assert drawer_multi.parsed_data == drawer_one.parsed_data
+    assert drawer_multi.graph_dict == drawer_one.graph_dict
+            
+# test_cli_isis_yed_data_dict_processes()
+
+
+def test_cli_isis_processes_none():
+    drawer = cli_isis_data(create_yed_diagram(), processes=None)
+    drawer.work(mock_data_xr)
+    assert drawer.graph_dict["links"]
+            
+# test_cli_isis_processes_none()
+
+
+def test_cli_isis_yed_data_path(tmp_path):
+    # form <data>/cisco_xr/ directory with three devices' LSDB output
+    platform_dir = tmp_path / "cisco_xr"
+    platform_dir.mkdir()
+    shutil.copy("./Data/SAMPLE_CISCO_IOSXR_ISIS_LSDB/router-1.txt", platform_dir)
+    (platform_dir / "router-x1.txt").write_text(mock_data_xr["cisco_xr"][0])
+    (platform_dir / "router-x2.txt").write_text(
+        mock_data_xr["cisco_xr"][0].replace("ROUTER-X1#", "ROUTER-X2#")
+    )
+    data_dict = {
+        "cisco_xr": [
+            (platform_dir / name).read_text() for name in os.listdir(platform_dir)
+        ]
+    }
+    drawer_dict = cli_isis_data(create_yed_diagram())
+    drawer_dict.work(data_dict)
+    drawer_path = cli_isis_data(create_yed_diagram())
+    drawer_path.work(str(tmp_path))
+    drawer_path_multi = cli_isis_data(create_yed_diagram(), processes=3)
+    drawer_path_multi.work(str(tmp_path))
+    assert len(drawer_path.parsed_data) == 3
+    assert drawer_path.parsed_data == drawer_dict.parsed_data
+    assert drawer_path_multi.parsed_data == drawer_dict.parsed_data
+            
+# test_cli_isis_yed_data_path()